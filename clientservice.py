@@ -1,22 +1,110 @@
 #!/usr/bin/env python3
+import os
 import sys
 import json
-import subprocess
-import urllib.request
+import re
+import shlex
+import shutil
+import signal
+import tempfile
+import http.client
 import urllib.parse
-import datetime
+import functools
+import gzip
 import ssl
-from collections import Counter
-from typing import Tuple, Dict, Any
+import time
+from collections import deque
+from typing import Tuple, Dict, Any, List, Optional, Union, BinaryIO, Callable
 
+try:
+    import orjson
+except ImportError:  # setup.sh only guarantees python3, keep stdlib working
+    orjson = None
 
-def utc_ts() -> str:
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # fall back to a plain http.client connection
+    requests = None
+
+try:
+    import ijson
+except ImportError:  # large task files are then loaded in memory as usual
+    ijson = None
+
+try:
+    import zstandard
+except ImportError:  # --compress then uses gzip
+    zstandard = None
+
+# Default seconds between runs in --daemon mode (matches the */10 cron entry).
+DAEMON_INTERVAL_S = 600
+
+# Task files larger than this are streamed with ijson (when installed).
+STREAM_THRESHOLD_BYTES = 5 * 1024 * 1024
+
+# With --compress, POST bodies larger than this are compressed.
+COMPRESS_MIN_BYTES = 1024
+
+# Hard limit for a single task command, and how many may run at once.
+COMMAND_TIMEOUT_S = 15
+MAX_RUNNING_COMMANDS = 16
+_REAP_POLL_S = 0.005
+
+_TS_FMT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Task status codes, used as indexes into the per-status counts list.
+STATUS_OK, STATUS_PENDING, STATUS_TIMEOUT, STATUS_ERROR = range(4)
+STATUS_NAMES = ("OK", "Pending", "Timeout", "Error")
+
+# Placeholders substituted into task commands; %GRUP% depends on the group id.
+_STATIC_PLACEHOLDERS = {
+    "%USER%": "guille",
+    "%HOME%": "/home/guille",
+    "%SSH_CONFIG%": "/home/guill/.ssh/config",
+}
+_PLACEHOLDER_RE = re.compile("|".join(map(re.escape, ["%GRUP%", *_STATIC_PLACEHOLDERS])))
+
+# Characters that need /bin/sh to interpret them (see split_command).
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n]")
+
+
+def json_loads(data: bytes) -> Any:
+    """
+    Parse JSON from raw bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
     """
-    Return the current UTC timestamp in ISO-8601 format.
+    Serialize obj to UTF-8 encoded JSON bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def utc_ts() -> bytes:
+    """
+    Return the current UTC timestamp in ISO-8601 format, as bytes.
     Used for cron-safe logging so each log line is timestamped
     and sortable.
+
+    The formatted value only changes once per second, so it is cached and
+    reused by every log line written within the same second.
     """
-    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime(_TS_FMT, time.gmtime(now)).encode("ascii")
+    return _ts_cache[1]
+
+
+# (epoch second, formatted timestamp) of the last utc_ts() call.
+_ts_cache: List[Any] = [-1, b""]
 
 
 def log_line(msg: str) -> None:
@@ -30,82 +118,265 @@ def log_line(msg: str) -> None:
     Convention:
       - Messages containing '[ERROR]' go to stderr
       - Everything else goes to stdout
+      - With --log-file, every message goes to that file instead (falling
+        back to the console if the write fails)
+
+    The line is written with a single os.write() so it is never split or
+    interleaved with other output.
     """
-    line = f"{utc_ts()} {msg}"
-    if "[ERROR]" in msg:
-        print(line, file=sys.stderr, flush=True)
-    else:
-        print(line, flush=True)
+    line = utc_ts() + b" " + msg.encode("utf-8", errors="replace") + b"\n"
+    if _log_fd is not None:
+        try:
+            os.write(_log_fd, line)
+            return
+        except OSError:
+            pass
+    os.write(2 if "[ERROR]" in msg else 1, line)
 
 
-def execute_commands(commands: Dict[str, Any], gid: str) -> Tuple[Dict[str, Any], Counter]:
+def open_log_file(log_path: str) -> None:
     """
-    Execute all commands found in the tasks JSON structure.
+    Open log_path once for the whole run and send log_line output to it.
+
+    The file is opened with O_APPEND, so each log line lands at the end of
+    the file atomically even when several runs write to it at the same time.
+    If it cannot be opened, logging stays on the console.
+    """
+    global _log_fd
+    try:
+        _log_fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    except OSError as e:
+        log_line(f"[ERROR] Failed to open log file {log_path}: {e}")
+
+
+# File descriptor opened by open_log_file, or None to log to the console.
+_log_fd: Optional[int] = None
+
+
+class Task:
+    """
+    One entry of a zone's "tasks" list while it is being executed.
+
+    The fields read and written per task live in slots instead of the JSON
+    dict. The original dict is kept in `data` and only gets the final
+    status written back by to_json() right before the results are POSTed.
+    """
+    __slots__ = ("command", "argv", "executable", "data", "status")
+
+    def __init__(
+        self,
+        command: Optional[str],
+        argv: Optional[List[str]],
+        executable: Optional[str],
+        data: Dict[str, Any],
+        status: str = "Pending",
+    ) -> None:
+        self.command = command
+        self.argv = argv
+        self.executable = executable
+        self.data = data
+        self.status = status
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Task":
+        command = data.get("command")
+        argv, executable = split_command(command, bool(data.get("shell")))
+        return cls(command, argv, executable, data)
+
+    def to_json(self) -> Dict[str, Any]:
+        self.data["status"] = self.status
+        return self.data
+
+
+def split_command(
+    cmd: Optional[str],
+    shell: bool = False,
+) -> Tuple[Optional[List[str]], Optional[str]]:
+    """
+    Pre-split a task command into an argv list and resolve its program to
+    an absolute path, or return (None, None) if it needs /bin/sh.
+
+    Commands that can run without a shell are then exec'd directly, saving
+    the /bin/sh fork+exec per task. A command keeps going through the shell
+    when the task sets "shell": true, when it uses shell syntax (pipes,
+    redirections, expansions, globs, ...), or when its program is not an
+    executable on PATH (e.g. shell builtins such as cd).
+
+    Returns:
+        (argv, executable) or (None, None)
+    """
+    if not cmd or shell or _SHELL_SYNTAX_RE.search(cmd):
+        return None, None
+    try:
+        argv = shlex.split(cmd)
+    except ValueError:
+        return None, None
+    if not argv or "=" in argv[0]:
+        return None, None
+    try:
+        executable = shutil.which(argv[0])
+    except ValueError:  # e.g. an embedded NUL byte
+        return None, None
+    if executable is None:
+        return None, None
+    return argv, os.path.abspath(executable)
+
+
+def tasks_from_json(commands: Dict[str, Any]) -> None:
+    """
+    Replace every task dict in the tasks JSON with a Task, in place.
+    """
+    for zone in commands.get("zones", []):
+        if "tasks" in zone:
+            zone["tasks"] = [Task.from_json(task) for task in zone["tasks"]]
+
+
+def tasks_to_json(commands: Dict[str, Any]) -> None:
+    """
+    Turn every Task back into its JSON dict (with its status), in place.
+    """
+    for zone in commands.get("zones", []):
+        if "tasks" in zone:
+            zone["tasks"] = [task.to_json() for task in zone["tasks"]]
+
+
+def execute_commands(commands: Dict[str, Any], gid: str) -> Tuple[Dict[str, Any], List[int]]:
+    """
+    Execute all commands found in the tasks JSON structure, whose tasks
+    must already have been converted by tasks_from_json.
 
     - Replaces %GRUP% placeholders with the zero-padded group id
-    - Executes each command with a timeout
+    - Keeps up to MAX_RUNNING_COMMANDS commands running at once
+    - Kills any command that runs longer than COMMAND_TIMEOUT_S
     - Writes the execution status back into the task
     - Counts how many tasks ended in each status
 
+    Task statuses:
+        "OK"       -> command exited with return code 0
+        "Pending"  -> command missing, failed or returned non-zero
+        "Timeout"  -> command exceeded execution timeout
+        "Error"    -> command could not be started
+
     Returns:
-        (updated_commands_json, status_counter)
+        (updated_commands_json, status_counts) where status_counts is
+        indexed by the STATUS_* codes
     """
     zones = commands.get("zones", [])
     sanitized_id = gid.zfill(2)
-    counts = Counter()
-
-    for zone in zones:
-        for task in zone.get("tasks", []):
-            result = sanitize_execute_command(task.get("command"), sanitized_id)
-            task["status"] = result
-            counts[result] += 1
+    # Built once per run and shared by every task.
+    placeholders = {**_STATIC_PLACEHOLDERS, "%GRUP%": f"grup{sanitized_id}"}
+    counts = [0] * len(STATUS_NAMES)
+
+    def repl(match: "re.Match") -> str:
+        return placeholders[match.group(0)]
+
+    queue = deque(task for zone in zones for task in zone.get("tasks", []))
+    running: Dict[int, Tuple[Task, float]] = {}
+
+    def finish(task: Task, result: int) -> None:
+        task.status = STATUS_NAMES[result]
+        counts[result] += 1
+
+    while queue or running:
+        while queue and len(running) < MAX_RUNNING_COMMANDS:
+            task = queue.popleft()
+            if not task.command:
+                finish(task, STATUS_PENDING)
+                continue
+            try:
+                pid = sanitize_execute_command(task.command, repl, task.argv, task.executable)
+            except Exception:
+                finish(task, STATUS_ERROR)
+                continue
+            running[pid] = (task, time.monotonic() + COMMAND_TIMEOUT_S)
+
+        if not running:
+            continue
+
+        # Reap every child that already exited without blocking.
+        reaped = False
+        while running:
+            try:
+                pid, wait_status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                # SIGCHLD is ignored, so the kernel already reaped every
+                # child and their exit status is lost. Like Popen.wait(),
+                # count them as exited with 0.
+                for task, _ in running.values():
+                    finish(task, STATUS_OK)
+                running.clear()
+                reaped = True
+                break
+            if pid == 0:
+                break
+            entry = running.pop(pid, None)
+            if entry is None:
+                continue
+            # os.waitstatus_to_exitcode() is 3.9+, check the status by hand.
+            ok = os.WIFEXITED(wait_status) and os.WEXITSTATUS(wait_status) == 0
+            finish(entry[0], STATUS_OK if ok else STATUS_PENDING)
+            reaped = True
+
+        now = time.monotonic()
+        for pid, (task, deadline) in list(running.items()):
+            if now >= deadline:
+                del running[pid]
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    # Already exited and reaped by the kernel (SIGCHLD ignored).
+                    finish(task, STATUS_OK)
+                    continue
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    pass
+                finish(task, STATUS_TIMEOUT)
+
+        if running and not reaped:
+            time.sleep(_REAP_POLL_S)
 
     return commands, counts
 
 
-def sanitize_execute_command(cmd: str, gid: str) -> str:
+def sanitize_execute_command(
+    cmd: str,
+    repl: Callable[["re.Match"], str],
+    argv: Optional[List[str]] = None,
+    executable: Optional[str] = None,
+) -> int:
     """
-    Safely execute a single shell command.
+    Safely start a single command and return its pid.
 
-    - Replaces placeholders (%GRUP%, %USER%, etc.)
+    - Replaces placeholders (%GRUP%, %USER%, etc.) through repl, the
+      _PLACEHOLDER_RE replacement that execute_commands builds once for
+      all tasks
+    - Runs argv directly when split_command pre-split it, otherwise
+      runs cmd through /bin/sh
     - Suppresses stdout/stderr of the executed command itself
-    - Enforces a hard timeout
-    - Normalizes execution result into a small set of states
-
-    Returns:
-        "OK"       -> command exited with return code 0
-        "Pending"  -> command failed or returned non-zero
-        "Timeout"  -> command exceeded execution timeout
-        "Error"    -> unexpected execution error
-    """
-    if not cmd:
-        return "Pending"
+    - Starts every command in its own process group so a timeout can kill
+      the whole group, including any children the command started
 
-    placeholders = {
-        "%GRUP%": f"grup{gid}",
-        "%USER%": "guille",
-        "%HOME%": "/home/guille",
-        "%SSH_CONFIG%": "/home/guill/.ssh/config",
-    }
+    Commands are started with os.posix_spawn() instead of subprocess,
+    which would fall back to fork()+exec() for a new process group and so
+    copy the page tables of this (large) interpreter for every task. It
+    needs the absolute executable path that split_command resolved.
 
-    for key, value in placeholders.items():
-        cmd = cmd.replace(key, value)
+    Waiting, timeout enforcement and status normalization are done by
+    execute_commands, which schedules many commands at once.
+    """
+    if argv is not None:
+        path, args = executable, [_PLACEHOLDER_RE.sub(repl, arg) for arg in argv]
+    else:
+        path, args = "/bin/sh", ["/bin/sh", "-c", _PLACEHOLDER_RE.sub(repl, cmd)]
+    return os.posix_spawn(path, args, os.environ, file_actions=_SPAWN_FILE_ACTIONS, setpgroup=0)
 
-    s_cmd = cmd
 
-    try:
-        completed = subprocess.run(
-            s_cmd,
-            shell=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=15,
-        )
-        return "OK" if completed.returncode == 0 else "Pending"
-    except subprocess.TimeoutExpired:
-        return "Timeout"
-    except Exception:
-        return "Error"
+# Redirects the stdout/stderr of spawned task commands to /dev/null.
+_SPAWN_FILE_ACTIONS = [
+    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+]
 
 
 def normalize_url(webserver: str) -> str:
@@ -121,32 +392,19 @@ def normalize_url(webserver: str) -> str:
     return webserver
 
 
-def send_post(
-    url: str,
-    group_id: str,
-    payload: Dict[str, Any],
-    timeout_s: int = 20,
-    insecure: bool = False,
-) -> Dict[str, Any]:
+def _build_final_url(url: str, group_id: str) -> str:
     """
-    Send task execution results to the remote server using HTTP POST.
-
-    - Adds group_id as a query parameter
-    - Sends JSON body
-    - Uses system CA trust store for TLS validation
-    - Returns a structured summary of the request/response
+    Return the update endpoint URL with group_id appended to its query string.
 
-    If insecure=True, TLS certificate validation is disabled.
-    Intended ONLY for testing environments.
+    Called once per process by main(), since the endpoint and group id are
+    fixed for the life of the process.
     """
-    context = ssl._create_unverified_context() if insecure else ssl.create_default_context()
-
     url = normalize_url(url)
 
     parsed = urllib.parse.urlsplit(url)
     q = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
     q.append(("group_id", group_id))
-    final_url = urllib.parse.urlunsplit((
+    return urllib.parse.urlunsplit((
         parsed.scheme,
         parsed.netloc,
         parsed.path,
@@ -154,46 +412,497 @@ def send_post(
         parsed.fragment,
     ))
 
-    body = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
+
+class PostResponse:
+    """
+    Structured summary of a post_results request/response.
+
+    The response body is kept as raw bytes. It is only parsed when
+    response_json is read, since the cron run just logs a prefix of it.
+    """
+    __slots__ = ("requested_url", "method_sent", "status_code", "group_id", "response_raw", "content_type")
+
+    def __init__(
+        self,
+        requested_url: str,
+        method_sent: str,
+        status_code: int,
+        group_id: str,
+        response_raw: bytes,
+        content_type: str,
+    ) -> None:
+        self.requested_url = requested_url
+        self.method_sent = method_sent
+        self.status_code = status_code
+        self.group_id = group_id
+        self.response_raw = response_raw
+        self.content_type = content_type
+
+    @property
+    def response_json(self) -> Any:
+        """
+        The parsed JSON body for successful JSON responses, else the body text.
+        """
+        if 200 <= self.status_code < 400 and self.content_type.startswith("application/json"):
+            return json_loads(self.response_raw)
+        return self.response_raw.decode("utf-8", errors="replace")
+
+
+def post_results(
+    final_url: str,
+    group_id: str,
+    payload: Union[Dict[str, Any], BinaryIO],
+    timeout_s: int = 20,
+    insecure: bool = False,
+    compress: bool = False,
+    http2: bool = False,
+) -> PostResponse:
+    """
+    Send task execution results to the remote server using HTTP POST.
+
+    - Posts to final_url, which already carries group_id as a query
+      parameter (see _build_final_url)
+    - Sends JSON body (payload is either a dict to encode or a binary
+      file already holding the encoded JSON, which is streamed)
+    - Uses system CA trust store for TLS validation
+    - Returns a structured summary of the request/response
+
+    If insecure=True, TLS certificate validation is disabled.
+    Intended ONLY for testing environments.
+
+    If compress=True, bodies above COMPRESS_MIN_BYTES are sent with
+    Content-Encoding zstd (or gzip when zstandard is not installed). The
+    server must accept compressed request bodies.
+
+    If http2=True and httpx is installed, the POST goes over the shared
+    HTTP/2 client (see --daemon). Otherwise requests, or else http.client,
+    is used over HTTP/1.1.
+
+    main() binds this once per process with functools.partial, since the
+    endpoint, group id and TLS/compression options never change during a
+    run.
+    """
+    body = json_dumps(payload) if isinstance(payload, dict) else payload
+    headers = {"Content-Type": "application/json"}
+    compressed_file = None
+    if compress and _body_length(body) > COMPRESS_MIN_BYTES:
+        body, headers["Content-Encoding"] = compress_body(body)
+        if not isinstance(body, bytes):
+            compressed_file = body
+    headers["Content-Length"] = str(_body_length(body))
+
+    try:
+        if http2 and _httpx_client(insecure) is not None:
+            status, ctype, raw = _post_httpx(final_url, body, headers, timeout_s, insecure)
+        elif requests is not None:
+            status, ctype, raw = _post_session(final_url, body, headers, timeout_s, insecure)
+        else:
+            status, ctype, raw = _post_http_client(final_url, body, headers, timeout_s, insecure)
+    except Exception as e:
+        status, ctype, raw = -1, "", f"{type(e).__name__}: {e}".encode("utf-8")
+    finally:
+        if compressed_file is not None:
+            compressed_file.close()
+
+    return PostResponse(final_url, "POST", status, group_id, raw, ctype)
+
+
+def _body_length(body: Union[bytes, BinaryIO]) -> int:
+    """
+    Return the size in bytes of a POST body given as bytes or as a file.
+    """
+    if isinstance(body, bytes):
+        return len(body)
+    return os.fstat(body.fileno()).st_size
+
+
+def compress_body(body: Union[bytes, BinaryIO]) -> Tuple[Union[bytes, BinaryIO], str]:
+    """
+    Compress a POST body with zstd when zstandard is installed, else gzip.
+
+    A file body is compressed into a new temporary file, which the caller
+    must close.
+
+    Returns:
+        (compressed_body, content_encoding)
+    """
+    if isinstance(body, bytes):
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+        return gzip.compress(body, compresslevel=1), "gzip"
+
+    out = tempfile.TemporaryFile()
+    if zstandard is not None:
+        zstandard.ZstdCompressor(level=3).copy_stream(body, out)
+        encoding = "zstd"
+    else:
+        with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=1) as gz:
+            shutil.copyfileobj(body, gz)
+        encoding = "gzip"
+    out.seek(0)
+    return out, encoding
+
+
+@functools.lru_cache(maxsize=2)
+def _httpx_client(insecure: bool) -> Optional[Any]:
+    """
+    Return the shared HTTP/2 client for POSTs, built once per insecure value,
+    or None when httpx or h2 is not installed.
+
+    Over HTTP/2 one TCP+TLS connection carries any number of concurrent
+    requests, which is what a long-running --daemon process wants. httpx is
+    only imported here, so one-shot cron runs never pay for importing it.
+    """
+    try:
+        import httpx
+
+        # Raises ImportError too when h2 is missing, since http2=True needs it.
+        return httpx.Client(
+            http2=True,
+            verify=not insecure,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            timeout=20.0,
+        )
+    except ImportError:  # fall back to requests / http.client (HTTP/1.1)
+        return None
+
+
+def _post_httpx(
+    final_url: str,
+    body: Union[bytes, BinaryIO],
+    headers: Dict[str, str],
+    timeout_s: int,
+    insecure: bool,
+) -> Tuple[int, str, bytes]:
+    """
+    POST body through the shared httpx HTTP/2 client (used in --daemon mode
+    when httpx and h2 are installed).
+
+    Returns:
+        (status_code, content_type, raw_response_body)
+    """
+    if isinstance(body, bytes):
+        content = body
+    else:
+        content = iter(functools.partial(body.read, 64 * 1024), b"")
+    resp = _httpx_client(insecure).post(final_url, content=content, headers=headers, timeout=timeout_s)
+    return resp.status_code, resp.headers.get("Content-Type", ""), resp.content
+
+
+def _post_session(
+    final_url: str,
+    body: Union[bytes, BinaryIO],
+    headers: Dict[str, str],
+    timeout_s: int,
+    insecure: bool,
+) -> Tuple[int, str, bytes]:
+    """
+    POST body through the shared requests session (used when requests is
+    installed, unless _post_httpx is).
+
+    Returns:
+        (status_code, content_type, raw_response_body)
+    """
+    resp = _session().post(
         final_url,
         data=body,
-        method="POST",
-        headers={"Content-Type": "application/json"},
+        headers=headers,
+        timeout=timeout_s,
+        allow_redirects=False,
+        verify=not insecure,
     )
+    return resp.status_code, resp.headers.get("Content-Type", ""), resp.content
+
+
+@functools.lru_cache(maxsize=1)
+def _session() -> "requests.Session":
+    """
+    Return the shared requests session for POSTs, built on first use.
+
+    Keeping one session for the lifetime of the process lets consecutive
+    POSTs (see --daemon) reuse the same keep-alive TCP+TLS connection.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return session
+
+
+@functools.lru_cache(maxsize=2)
+def _ssl_context(insecure: bool) -> ssl.SSLContext:
+    """
+    Return the TLS context for POSTs, built once per insecure value.
+
+    Creating the default context loads and parses the system CA bundle, so
+    it is only done on first use instead of on every request.
+    """
+    return ssl._create_unverified_context() if insecure else ssl.create_default_context()
+
+
+def _post_http_client(
+    final_url: str,
+    body: Union[bytes, BinaryIO],
+    headers: Dict[str, str],
+    timeout_s: int,
+    insecure: bool,
+) -> Tuple[int, str, bytes]:
+    """
+    POST body over a persistent http.client connection (used when requests
+    is not installed and _post_httpx is not used).
+
+    The connection is kept module-level and reused while the scheme, host
+    and TLS mode stay the same, so --daemon runs keep one keep-alive
+    connection open. A reused connection that the server already closed is
+    retried once on a fresh one.
+
+    Returns:
+        (status_code, content_type, raw_response_body)
+    """
+    parsed = urllib.parse.urlsplit(final_url)
+    target = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    key = (parsed.scheme, parsed.netloc, insecure)
+    reused = _conn is not None and _conn_key == key
+    start = 0 if isinstance(body, bytes) else body.tell()
 
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s, context=context) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
-            ctype = resp.headers.get("Content-Type", "")
-            return {
-                "requested_url": final_url,
-                "method_sent": "POST",
-                "status_code": resp.status,
-                "group_id": group_id,
-                "response_json": json.loads(raw) if ctype.startswith("application/json") else raw,
-            }
-
-    except urllib.error.HTTPError as e:
+        return _http_client_exchange(key, target, body, headers, timeout_s)
+    except (ConnectionError, ssl.SSLEOFError):
+        if not reused:
+            raise
+        if not isinstance(body, bytes):
+            body.seek(start)
+        return _http_client_exchange(key, target, body, headers, timeout_s)
+
+
+def _http_client_exchange(
+    key: Tuple[str, str, bool],
+    target: str,
+    body: Union[bytes, BinaryIO],
+    headers: Dict[str, str],
+    timeout_s: int,
+) -> Tuple[int, str, bytes]:
+    """
+    Send one POST on the cached connection for key, opening it if needed.
+    """
+    global _conn, _conn_key
+
+    if _conn is None or _conn_key != key:
+        if _conn is not None:
+            _conn.close()
+        scheme, netloc, insecure = key
+        if scheme == "https":
+            _conn = http.client.HTTPSConnection(netloc, timeout=timeout_s, context=_ssl_context(insecure))
+        else:
+            _conn = http.client.HTTPConnection(netloc, timeout=timeout_s)
+        _conn_key = key
+
+    try:
+        _conn.request("POST", target, body=body, headers={**headers, "Connection": "keep-alive"})
+        resp = _conn.getresponse()
+        raw = resp.read()
+    except Exception:
+        _conn.close()
+        _conn = None
+        raise
+
+    if resp.will_close:
+        _conn.close()
+        _conn = None
+    return resp.status, resp.getheader("Content-Type", ""), raw
+
+
+# Connection reused by _post_http_client, and the (scheme, netloc, insecure)
+# it was opened for.
+_conn: Optional[http.client.HTTPConnection] = None
+_conn_key: Optional[Tuple[str, str, bool]] = None
+
+
+def load_tasks(task_path: str) -> Dict[str, Any]:
+    """
+    Read and parse the tasks JSON downloaded from the tasks endpoint,
+    with its tasks converted to Task objects (see tasks_from_json).
+    """
+    with open(task_path, "rb") as f:
+        data = json_loads(f.read())
+    tasks_from_json(data)
+    return data
+
+
+def build_counts_payload(counts: List[int]) -> Dict[str, int]:
+    """
+    Return the per-status task counts in the layout the server expects.
+    """
+    return dict(zip(STATUS_NAMES, counts))
+
+
+def run_once(group_id: str, task_path: str, post: Callable[..., PostResponse]) -> bool:
+    """
+    Load the tasks file, execute every task once and report the results
+    with post (post_results bound to the endpoint and options by main()).
+
+    Task files above STREAM_THRESHOLD_BYTES are streamed zone by zone when
+    ijson is installed and _scan_tasks_file accepts them; smaller ones use
+    the faster in-memory path.
+
+    Returns:
+        False if the tasks file could not be loaded, True otherwise.
+    """
+    try:
+        stream = ijson is not None and os.path.getsize(task_path) > STREAM_THRESHOLD_BYTES
+    except OSError as e:
+        log_line(f"[ERROR] Failed to load tasks: {e}")
+        return False
+
+    members = None
+    if stream:
         try:
-            body = e.read().decode("utf-8", errors="replace")
+            with open(task_path, "rb") as f:
+                members = _scan_tasks_file(f)
         except Exception:
-            body = ""
-        return {
-            "requested_url": final_url,
-            "method_sent": "POST",
-            "status_code": e.code,
-            "group_id": group_id,
-            "response_json": body,
-        }
+            # Nothing has run yet: let load_tasks either load the file (e.g.
+            # integers yajl cannot hold) or report why it is invalid, exactly
+            # as it does for small files.
+            pass
+
+    if members is not None:
+        with tempfile.TemporaryFile() as body:
+            try:
+                counts = stream_execute_commands(task_path, group_id, members, body)
+            except Exception as e:
+                log_line(f"[ERROR] Failed to load tasks: {e}")
+                return False
+            body.seek(0)
+            report_results(group_id, counts, body, post)
+        return True
+
+    try:
+        data = load_tasks(task_path)
     except Exception as e:
-        return {
-            "requested_url": final_url,
-            "method_sent": "POST",
-            "status_code": -1,
-            "group_id": group_id,
-            "response_json": f"{type(e).__name__}: {e}",
-        }
+        log_line(f"[ERROR] Failed to load tasks: {e}")
+        return False
+
+    command_data, counts = execute_commands(data, group_id)
+    tasks_to_json(command_data)
+    payload = {
+        "tasks": command_data,      
+        "counts": build_counts_payload(counts),   
+    }
+    report_results(group_id, counts, payload, post)
+    return True
+
+
+def stream_execute_commands(
+    task_path: str,
+    gid: str,
+    members: Dict[str, Any],
+    out: BinaryIO,
+) -> List[int]:
+    """
+    Execute a large tasks file one zone at a time, writing the POST body to out.
+
+    members is what _scan_tasks_file returned for the file. Only the zone
+    being executed is held in memory, plus the top-level members other
+    than "zones", which are re-emitted as they are. The body written to out
+    is the same {"tasks": {...}, "counts": {...}} document the in-memory
+    path posts.
+
+    Returns:
+        status_counts for all executed tasks, indexed by the STATUS_* codes
+    """
+    counts = [0] * len(STATUS_NAMES)
+    with open(task_path, "rb") as f:
+        out.write(b'{"tasks":{')
+        for i, (key, value) in enumerate(members.items()):
+            if i:
+                out.write(b",")
+            out.write(json_dumps(key) + b":")
+            if key != "zones":
+                out.write(json_dumps(value))
+                continue
+            out.write(b"[")
+            for j, zone in enumerate(ijson.items(f, "zones.item", use_float=True)):
+                zone_data = {"zones": [zone]}
+                tasks_from_json(zone_data)
+                _, zone_counts = execute_commands(zone_data, gid)
+                tasks_to_json(zone_data)
+                counts = [a + b for a, b in zip(counts, zone_counts)]
+                if j:
+                    out.write(b",")
+                out.write(json_dumps(zone))
+            out.write(b"]")
+    out.write(b'},"counts":')
+    out.write(json_dumps(build_counts_payload(counts)))
+    out.write(b"}")
+    return counts
+
+
+# ijson events allowed at each (prefix, depth) that tasks_from_json reads.
+_STREAM_SHAPE = {
+    ("zones", 1): ("start_array", "end_array"),
+    ("zones.item", 2): ("start_map", "end_map"),
+    ("zones.item.tasks", 3): ("start_array", "end_array"),
+    ("zones.item.tasks.item", 4): ("start_map", "end_map"),
+    ("zones.item.tasks.item.command", 5): ("string", "null"),
+}
+
+
+def _scan_tasks_file(f: BinaryIO) -> Dict[str, Any]:
+    """
+    Parse the whole tasks file with ijson without building its zones.
+
+    Raises if the file is not valid JSON, or if its zones and tasks do not
+    have the layout tasks_from_json expects, with every "command" a string
+    or null. Once this passes, no zone can fail to load after earlier zones
+    already ran.
+
+    Returns:
+        the top-level members in file order, built in memory, except
+        "zones", which maps to None
+    """
+    members: Dict[str, Any] = {}
+    builder = None
+    depth = 0
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            if event not in ("start_map", "end_map"):
+                raise ValueError("tasks file is not a JSON object")
+        elif depth == 1 and event == "map_key":
+            builder = None if value == "zones" else ijson.ObjectBuilder()
+            members[value] = builder
+        elif builder is not None:
+            builder.event(event, value)
+        else:
+            allowed = _STREAM_SHAPE.get((prefix, depth))
+            if allowed is not None and event not in allowed:
+                raise ValueError(f"tasks file has unexpected {event} at {prefix}")
+        if event in ("start_map", "start_array"):
+            depth += 1
+    return {key: (b.value if b is not None else None) for key, b in members.items()}
+
+
+def report_results(
+    group_id: str,
+    counts: List[int],
+    payload: Union[Dict[str, Any], BinaryIO],
+    post: Callable[..., PostResponse],
+) -> None:
+    """
+    Log the execution summary, POST the results and log the response.
+    """
+    summary = " ".join(f"{name}={n}" for name, n in zip(STATUS_NAMES, counts))
+    log_line(f"[RUN] group_id={group_id} execute_summary {summary}")
+
+    resp = post(payload)
+
+    body = resp.response_raw[:300].decode("utf-8", errors="replace")
+    if len(resp.response_raw) > 300:
+        body += "...(truncated)"
+
+    log_line(f"[POST] status={resp.status_code} url={resp.requested_url} resp={body}")
+
+    # Keep the existing behavior: print status code (cron captures it too)
+    print(resp.status_code, flush=True)
 
 
 def main() -> None:
@@ -209,53 +918,61 @@ def main() -> None:
     - Prints an execution summary
     - Sends results to the server
     """
-    if len(sys.argv) not in (4, 5):
-        print("Usage: clientservice.py <group_id> <tasks.json> <update_endpoint> <Test>", file=sys.stderr)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+
+    daemon_interval = None
+    log_path = None
+    compress = False
+    for flag in flags:
+        name, _, value = flag.partition("=")
+        if name == "--daemon" and (not value or (value.isdigit() and int(value) > 0)):
+            daemon_interval = int(value) if value else DAEMON_INTERVAL_S
+        elif name == "--log-file" and value:
+            log_path = value
+        elif flag == "--compress":
+            compress = True
+        else:
+            args = []  # unknown flag: fall through to usage
+            break
+
+    if len(args) not in (3, 4):
+        print(
+            "Usage: clientservice.py <group_id> <tasks.json> <update_endpoint> <Test>"
+            " [--daemon[=SECONDS]] [--log-file=PATH] [--compress]",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
-    group_id = sys.argv[1]
-    task_path = sys.argv[2]
-    update_end_point = sys.argv[3]
-    TEST = sys.argv[4] if len(sys.argv) >= 5 else "False"
+    if log_path is not None:
+        open_log_file(log_path)
 
-    log_line("[RUN] Starting cron job")
-    try:
-        with open(task_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        log_line(f"[ERROR] Failed to load tasks: {e}")
-        sys.exit(2)
+    group_id = args[0]
+    task_path = args[1]
+    update_end_point = args[2]
+    TEST = args[3] if len(args) >= 4 else "False"
+    insecure = (TEST == "True")
 
-    command_data, counts = execute_commands(data, group_id)
-    summary = " ".join(f"{k}={counts.get(k, 0)}" for k in ("OK", "Pending", "Timeout", "Error"))
-    log_line(f"[RUN] group_id={group_id} execute_summary {summary}")
-
-    counts_payload = {
-        "OK": int(counts.get("OK", 0)),
-        "Pending": int(counts.get("Pending", 0)),
-        "Timeout": int(counts.get("Timeout", 0)),
-        "Error": int(counts.get("Error", 0)),
-    }
-    payload = {
-        "tasks": command_data,      
-        "counts": counts_payload,   
-    }
-
-    resp = send_post(
-        update_end_point,
+    post = functools.partial(
+        post_results,
+        _build_final_url(update_end_point, group_id),
         group_id,
-        payload,
-        insecure=(TEST == "True"),
+        insecure=insecure,
+        compress=compress,
+        http2=daemon_interval is not None,
     )
 
-    body = str(resp.get("response_json", ""))
-    if len(body) > 300:
-        body = body[:300] + "...(truncated)"
-
-    log_line(f"[POST] status={resp.get('status_code')} url={resp.get('requested_url')} resp={body}")
-
-    # Keep the existing behavior: print status code (cron captures it too)
-    print(resp.get("status_code", -1))
+    if daemon_interval is None:
+        log_line("[RUN] Starting cron job")
+        if not run_once(group_id, task_path, post):
+            sys.exit(2)
+        return
+
+    log_line(f"[RUN] Starting daemon interval={daemon_interval}s")
+    while True:
+        started = time.monotonic()
+        run_once(group_id, task_path, post)
+        time.sleep(max(0.0, daemon_interval - (time.monotonic() - started)))
 
 
 if __name__ == "__main__":
@@ -48,7 +48,7 @@ fi
 success "Confirmed Group ID: $GROUP_ID"
 echo "GROUP_ID=${GROUP_ID}" >> "$RUNTIME_ENV"
 
-APT_PACKAGES=( python3 openssl ca-certificates)
+APT_PACKAGES=( python3 python3-requests openssl ca-certificates)
 export DEBIAN_FRONTEND=noninteractive
 apt-get update -qq || fail "Apt update failed"
 if apt-get install -y -qq "${APT_PACKAGES[@]}" > /dev/null 2>&1; then